@@ -2,18 +2,34 @@
 # A tool to replace the art and names of MTG Arena cards.
 # Final version with all bug fixes and features.
 
+import atexit
+import bisect
+import contextlib
+import io
+import math
 import platform
+import queue
 import shutil
 import sqlite3
+import subprocess
 import time
 import json
+import multiprocessing
 import os
 import sys
 import threading
 import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import unquote, urlsplit
 import requests
+from requests.adapters import HTTPAdapter
+import urllib3
+from urllib3.util.retry import Retry
 import UnityPy
 from PIL import Image
 
@@ -24,24 +40,134 @@ from tkinter import ttk, scrolledtext, font, filedialog, messagebox
 # Configure UnityPy with a fallback version. This will be updated by auto-detection.
 UnityPy.config.FALLBACK_UNITY_VERSION = "2022.3.42f1"
 
+# Unity version string as stored in the level0 header, e.g. 2022.3.42f1.
+UNITY_VERSION_RE = re.compile(r"20\d{2}\.\d+\.\d+f\d+")
+# Scryfall card webpage, e.g. https://scryfall.com/card/spm/12/spider-man. Captures the set code and collector number.
+SCRYFALL_CARD_PAGE_RE = re.compile(r"^https?://(?:www\.)?scryfall\.com/card/([^/?#]+)/([^/?#]+)")
+# Scryfall card API URL by ID, e.g. https://api.scryfall.com/cards/41f18f42-b86b-4a12-9f0d-76b761571195.
+SCRYFALL_CARD_ID_URL_RE = re.compile(r"^https?://api\.scryfall\.com/cards/([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})/?$", re.IGNORECASE)
+# Scryfall card API URL by set and collector number, e.g. https://api.scryfall.com/cards/spm/12.
+# Other ID lookups such as /cards/multiverse/123 share the same shape and are excluded.
+SCRYFALL_CARD_SET_URL_RE = re.compile(
+    r"^https?://api\.scryfall\.com/cards/(?!(?:multiverse|mtgo|arena|tcgplayer|cardmarket)/)([a-z0-9]+)/([^/?#]+)/?$",
+    re.IGNORECASE
+)
+# Ranged asset bundles, e.g. cardart_100000_100999.bundle. Captures the kind, first ID and last ID.
+RANGED_BUNDLE_RE = re.compile(r"^(cardart|cards)_(\d+)_(\d+)\.bundle$")
+# Individual asset files, e.g. 412345_CardArt_abc123.mtga. Captures the ID and the kind.
+INDIVIDUAL_BUNDLE_RE = re.compile(r"^(\d+)_(CardArt|Card)_.*\.mtga$")
+
+# Scryfall returns search results in pages of this size.
+SCRYFALL_PAGE_SIZE = 175
+# Maximum number of Scryfall search pages fetched at the same time.
+SCRYFALL_MAX_WORKERS = 8
+# Maximum number of cards Scryfall's /cards/collection endpoint accepts per request.
+SCRYFALL_COLLECTION_BATCH_SIZE = 75
+# Maximum number of card lookups and art downloads running at the same time during a swap.
+DOWNLOAD_MAX_WORKERS = 16
+# Chunk size used when streaming downloaded art to disk.
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# Card lookup against the temporary table of wanted cards. The SQL text never changes,
+# so sqlite3's statement cache reuses the prepared query and SQLite plans it only once.
+# CROSS JOIN makes SQLite loop over the few wanted cards and seek into cards, instead of scanning cards.
+CARD_AND_ART_IDS_QUERY = (
+    "SELECT k.ExpansionCode, k.CollectorNumber, c.GrpId, c.ArtId FROM swap_keys k "
+    "CROSS JOIN cards c ON c.ExpansionCode = k.ExpansionCode AND c.CollectorNumber = k.CollectorNumber"
+)
+
+# How far Saga art is pre-shrunk with a box reduce before resampling (see Pillow's Image.resize).
+SAGA_RESIZE_REDUCING_GAP = 3.0
+
+# Original bundles are backed up here before they are modified.
+BACKUP_DIR = Path.home() / "MTGA_Swapper_Backups"
+# Folder for data the swapper caches between runs.
+CACHE_DIR = Path.home() / ".mtga_swapper"
+# Card lists of fetched sets, reused for a day before they are fetched again.
+SET_CACHE_DIR = CACHE_DIR / "sets"
+SET_CACHE_MAX_AGE = 24 * 60 * 60
+# Detected Unity versions, keyed by level0 path and invalidated when the file's size or mtime changes.
+UNITY_VERSION_CACHE_PATH = CACHE_DIR / "version.json"
+
+# Retries for rate limiting and transient server errors, waiting as long as Scryfall's Retry-After asks.
+# POST is included because /cards/collection only reads data.
+SCRYFALL_RETRY = Retry(
+    total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504],
+    allowed_methods=frozenset({"GET", "POST"}), respect_retry_after_header=True, raise_on_status=False
+)
+
+# Shared HTTP sessions so connections are kept alive and reused between requests.
+# The API (api.scryfall.com) and the image CDN (cards.scryfall.io) are different hosts, so each gets its own pool.
+scryfall_session = requests.Session()
+scryfall_session.mount("https://", HTTPAdapter(pool_connections=SCRYFALL_MAX_WORKERS, pool_maxsize=SCRYFALL_MAX_WORKERS, max_retries=SCRYFALL_RETRY))
+atexit.register(scryfall_session.close)
+
+image_session = requests.Session()
+image_session.mount("https://", HTTPAdapter(pool_connections=DOWNLOAD_MAX_WORKERS, pool_maxsize=DOWNLOAD_MAX_WORKERS, max_retries=SCRYFALL_RETRY))
+atexit.register(image_session.close)
+
+class RateLimiter:
+    """Thread-safe token bucket that allows bursts of up to `rate` calls and `rate` calls per `per` seconds on average."""
+    def __init__(self, rate: int, per: float = 1.0):
+        self.capacity = rate
+        self.tokens = float(rate)
+        self.fill_rate = rate / per
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Blocks until another call is allowed. Only sleeps for as long as the bucket is empty."""
+        with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.fill_rate)
+                self.last_refill = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                time.sleep((1 - self.tokens) / self.fill_rate)
+
+# Scryfall asks API clients to stay at or below 10 requests per second. Shared by every API call.
+scryfall_rate_limiter = RateLimiter(rate=10, per=1.0)
+
 # --- Helper Functions ---
 
 def configure_unity_version(data_path: Path):
     """
     Detects and configures the Unity version from the game's level0 file.
     This uses a direct slicing method which is more reliable for MTGA.
+    The result is cached until the game updates level0.
     """
     try:
         level0_path = data_path / "level0"
         if level0_path.exists():
-            with open(level0_path, "rb") as f:
-                # The version string is known to be in this byte range
-                version_text = f.read().decode("latin-1").strip()[40:60].replace("\x00", "")
-                if re.match(r"20\d{2}\.\d+\.\d+f\d+", version_text):
-                    UnityPy.config.FALLBACK_UNITY_VERSION = version_text
-                    print(f"✅ Automatically configured Unity version to: {version_text}")
-                else:
-                    print(f"⚠️ Could not parse Unity version from level0 file. Using fallback.")
+            level0_stat = level0_path.stat()
+            cache_key = str(level0_path)
+            try:
+                version_cache = json.loads(UNITY_VERSION_CACHE_PATH.read_text())
+            except (OSError, ValueError):
+                version_cache = {}
+
+            cached = version_cache.get(cache_key, {})
+            if cached.get("size") == level0_stat.st_size and cached.get("mtime_ns") == level0_stat.st_mtime_ns:
+                version_text = cached.get("version", "")
+            else:
+                with open(level0_path, "rb") as f:
+                    # The version string is known to be in this byte range, so only those 20 bytes are read
+                    f.seek(40)
+                    version_text = f.read(20).replace(b"\x00", b"").decode("ascii", "ignore").strip()
+
+            version_match = UNITY_VERSION_RE.match(version_text)
+            if version_match:
+                version_text = version_match.group(0)
+                UnityPy.config.FALLBACK_UNITY_VERSION = version_text
+                print(f"✅ Automatically configured Unity version to: {version_text}")
+                cache_entry = {"size": level0_stat.st_size, "mtime_ns": level0_stat.st_mtime_ns, "version": version_text}
+                if cached != cache_entry:
+                    version_cache[cache_key] = cache_entry
+                    UNITY_VERSION_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+                    UNITY_VERSION_CACHE_PATH.write_text(json.dumps(version_cache, indent=4))
+            else:
+                print(f"⚠️ Could not parse Unity version from level0 file. Using fallback.")
     except Exception as e:
         print(f"⚠️ Could not auto-detect Unity version: {e}. Using fallback.")
 
@@ -75,8 +201,19 @@ def find_mtga_path() -> Optional[Path]:
         return None
 
     print("🔍 Searching for MTG Arena installation...")
+    # List each parent folder once and check candidates against it, instead of a stat per candidate.
+    # Names are compared case-insensitively, like the Windows and macOS file systems do.
+    entries_by_parent: Dict[Path, set] = {}
     for path in paths_to_check:
-        if path.exists():
+        parent = path.parent
+        if parent not in entries_by_parent:
+            try:
+                with os.scandir(parent) as entries:
+                    entries_by_parent[parent] = {entry.name.casefold() for entry in entries}
+            except OSError:
+                entries_by_parent[parent] = set()
+
+        if path.name.casefold() in entries_by_parent[parent]:
             # Use our new, smarter helper to find the actual data root
             data_root = get_data_path(path)
 
@@ -89,15 +226,24 @@ def find_mtga_path() -> Optional[Path]:
     print("❌ Could not automatically find MTG Arena installation.")
     return None
 
+@lru_cache(maxsize=2048)
+def fetch_scryfall_json(api_url: str) -> Mapping:
+    """
+    Fetches a Scryfall API response and memoizes it for the rest of the session.
+    Errors are raised instead of returned, so failed lookups are never cached.
+    The result is read-only because the same object is shared between callers.
+    """
+    scryfall_rate_limiter.acquire()
+    response = scryfall_session.get(api_url)
+    response.raise_for_status()
+    return MappingProxyType(response.json())
+
 def get_original_card_details(card_name: str) -> Optional[Tuple[str, str]]:
     """Fetches the original set and collector number for a card by its name using the search endpoint."""
     try:
         search_query = f'!"{card_name}"'
         api_url = f"https://api.scryfall.com/cards/search?q={requests.utils.quote(search_query)}"
-        response = requests.get(api_url)
-        response.raise_for_status()
-        time.sleep(0.1)
-        data = response.json()
+        data = fetch_scryfall_json(api_url)
         if data.get("total_cards", 0) > 0:
             card_data = data["data"][0]
             return card_data.get('set', '').upper(), card_data.get('collector_number', '')
@@ -108,36 +254,101 @@ def get_original_card_details(card_name: str) -> Optional[Tuple[str, str]]:
         print(f"   - ❌ Could not find original card details for '{card_name}' on Scryfall.")
         return None
 
-def get_card_data_from_url(url: str) -> Optional[Dict]:
+def get_card_data_from_url(url: str) -> Optional[Mapping]:
     """
     Fetches card data from a Scryfall URL, automatically converting
     webpage URLs to API URLs if necessary.
     """
     api_url = url
-    if "scryfall.com/card" in api_url:
-        parts = api_url.split('/')
-        if len(parts) > 6:
-            api_url = '/'.join(parts[:-1])
+    page_match = SCRYFALL_CARD_PAGE_RE.match(url)
+    if page_match:
+        set_code, collector_number = page_match.groups()
+        api_url = f"https://api.scryfall.com/cards/{set_code}/{collector_number}"
 
     try:
-        response = requests.get(api_url)
-        response.raise_for_status()
-        time.sleep(0.1)
-        return response.json()
+        return fetch_scryfall_json(api_url)
     except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
         print(f"❌ Error fetching card data for {url}: {e}")
         return None
 
+def get_scryfall_identifier(url: str) -> Optional[Dict[str, str]]:
+    """
+    Turns a Scryfall card URL into a card identifier for the /cards/collection endpoint.
+    Returns None for URLs that can only be fetched directly.
+    """
+    id_match = SCRYFALL_CARD_ID_URL_RE.match(url)
+    if id_match:
+        return {"id": id_match.group(1).lower()}
+
+    set_match = SCRYFALL_CARD_SET_URL_RE.match(url) or SCRYFALL_CARD_PAGE_RE.match(url)
+    if set_match:
+        # URLs percent-encode collector numbers such as 1★, but the collection endpoint expects the plain text
+        set_code, collector_number = (unquote(part) for part in set_match.groups())
+        return {"set": set_code.lower(), "collector_number": collector_number}
+    return None
+
+def get_identifier_key(identifier: Dict[str, str]) -> Tuple[str, ...]:
+    """Returns a hashable key for a card identifier, so cards in a collection response can be matched back to it."""
+    if "id" in identifier:
+        return ("id", identifier["id"])
+    return ("set", identifier["set"], identifier["collector_number"])
+
+def fetch_scryfall_cards(urls: List[str]) -> Dict[str, Mapping]:
+    """
+    Fetches card data for many Scryfall card URLs with as few requests as possible.
+    Cards are requested in batches of 75 from the /cards/collection endpoint;
+    URLs that can't be turned into an identifier are fetched one by one.
+    Returns the card data keyed by URL. Cards that couldn't be fetched are left out.
+    """
+    cards_by_url = {}
+    identifiers_by_url = {}
+    for url in dict.fromkeys(urls):
+        identifier = get_scryfall_identifier(url)
+        if identifier:
+            identifiers_by_url[url] = identifier
+        else:
+            card_data = get_card_data_from_url(url)
+            if card_data: cards_by_url[url] = card_data
+
+    unique_identifiers = list({get_identifier_key(identifier): identifier for identifier in identifiers_by_url.values()}.values())
+    cards_by_key = {}
+    for start in range(0, len(unique_identifiers), SCRYFALL_COLLECTION_BATCH_SIZE):
+        batch = unique_identifiers[start:start + SCRYFALL_COLLECTION_BATCH_SIZE]
+        try:
+            scryfall_rate_limiter.acquire()
+            response = scryfall_session.post("https://api.scryfall.com/cards/collection", json={"identifiers": batch})
+            response.raise_for_status()
+            collection = response.json()
+        except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+            print(f"❌ Error fetching a batch of {len(batch)} cards from Scryfall: {e}")
+            continue
+
+        for card_data in collection.get('data', []):
+            card_data = MappingProxyType(card_data)
+            cards_by_key[("id", card_data.get('id', ''))] = card_data
+            cards_by_key[("set", card_data.get('set', ''), card_data.get('collector_number', ''))] = card_data
+        for identifier in collection.get('not_found', []):
+            print(f"   - ⚠️ Scryfall could not find card: {identifier}")
+
+    for url, identifier in identifiers_by_url.items():
+        card_data = cards_by_key.get(get_identifier_key(identifier))
+        if card_data: cards_by_url[url] = card_data
+    return cards_by_url
+
 def download_image(url: str, dest_path: Path) -> bool:
     """Downloads an image from a URL to a destination path."""
     try:
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
-        with open(dest_path, 'wb') as f:
-            shutil.copyfileobj(response.raw, f)
+        with image_session.get(url, stream=True) as response:
+            response.raise_for_status()
+            # Let urllib3 undo any Content-Encoding, then copy straight from the socket in large chunks
+            response.raw.decode_content = True
+            with open(dest_path, 'wb') as f:
+                shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
         return True
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError, OSError) as e:
+        # Reading response.raw directly raises urllib3's own errors rather than requests' wrappers
         print(f"❌ Error downloading image {url}: {e}")
+        dest_path.unlink(missing_ok=True)
         return False
 
 def get_data_path(mtga_path: Path) -> Path:
@@ -176,15 +387,63 @@ def get_mtga_database(data_path: Path) -> Optional[Path]:
     print("❌ Could not find MTG Arena card database file.")
     return None
     
+def has_card_lookup_index(conn: sqlite3.Connection) -> bool:
+    """Checks whether the cards table already has an index that covers the lookup by set and collector number."""
+    for index_row in conn.execute("PRAGMA index_list(cards)").fetchall():
+        index_name = index_row[1].replace('"', '""')
+        columns = [row[2].lower() for row in conn.execute(f'PRAGMA index_info("{index_name}")') if row[2]]
+        if columns[:2] == ["expansioncode", "collectornumber"] and {"grpid", "artid"} <= set(columns):
+            return True
+    return False
+
+def get_indexed_database(db_path: Path) -> Path:
+    """
+    Returns a cached copy of the card database with a covering index for the card lookup.
+    The game's own database is never modified. If it already has such an index,
+    or the copy can't be made, the original is used.
+    """
+    cache_dir = CACHE_DIR / "db"
+    cached_db = cache_dir / db_path.name
+    # The database file name contains a content hash, so an existing copy is always up to date
+    if cached_db.exists():
+        return cached_db
+
+    tmp_db = cached_db.with_name(cached_db.name + ".tmp")
+    try:
+        conn = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro&immutable=1", uri=True)
+        try:
+            if has_card_lookup_index(conn):
+                return db_path
+        finally:
+            conn.close()
+
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        for stale_db in cache_dir.glob("*.mtga"):
+            stale_db.unlink()
+
+        shutil.copyfile(db_path, tmp_db)
+        conn = sqlite3.connect(tmp_db)
+        try:
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cards_exp_coll ON cards(ExpansionCode, CollectorNumber, GrpId, ArtId)")
+            conn.execute("ANALYZE cards")
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(tmp_db, cached_db)
+        print("   -> Indexed a copy of the card database for faster lookups.")
+        return cached_db
+    except (OSError, sqlite3.Error) as e:
+        print(f"⚠️ Could not index the card database: {e}. Using it as-is.")
+        tmp_db.unlink(missing_ok=True)
+        return db_path
+
 def get_card_and_art_ids_from_db(db_path: Path, swaps: List[Dict]) -> Dict[str, Tuple[int, int]]:
     """
     Retrieves MTGA card IDs (GrpId) and Art IDs using ExpansionCode and CollectorNumber.
+    All swaps are looked up with a single query instead of one query per card.
     """
     card_data = {}
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-
-    print("\n🔍 Finding Arena IDs for cards using Set and Collector Number...")
+    wanted_cards = []
     for swap in swaps:
         source_name = swap.get("source_card_name")
         exp_code = swap.get("expansion_code")
@@ -192,97 +451,254 @@ def get_card_and_art_ids_from_db(db_path: Path, swaps: List[Dict]) -> Dict[str,
 
         if not all([source_name, exp_code, coll_num]):
             continue
+        wanted_cards.append((source_name, (exp_code, str(coll_num))))
 
-        try:
-            # Fetch both GrpId and ArtId
-            query = "SELECT GrpId, ArtId FROM cards WHERE ExpansionCode = ? AND CollectorNumber = ?"
-            cursor.execute(query, (exp_code, str(coll_num)))
-            result = cursor.fetchone()
-            if result:
-                card_data[source_name] = (result[0], result[1]) # Store as a tuple (GrpId, ArtId)
-        except sqlite3.Error as e:
-            print(f"❌ Database error looking for {source_name}: {e}")
-            continue
-    
-    conn.close()
+    print("\n🔍 Finding Arena IDs for cards using Set and Collector Number...")
+    lookup_keys = list(dict.fromkeys(key for _, key in wanted_cards))
+    ids_by_key = {}
+    # Open read-only and immutable: SQLite can skip all locking and journal checks,
+    # which also makes memory-mapped reads cheap. WAL is left off since nothing is written.
+    db_uri = f"{Path(db_path).resolve().as_uri()}?mode=ro&immutable=1"
+    conn = sqlite3.connect(db_uri, uri=True, cached_statements=256)
+    try:
+        conn.executescript(
+            "PRAGMA mmap_size=268435456;"
+            "PRAGMA cache_size=-65536;"
+            "PRAGMA temp_store=MEMORY;"
+        )
+        with conn:
+            # The wanted cards go into an in-memory temp table, which is allowed on a read-only database.
+            # Joining against it keeps the query text constant whatever the number of swaps.
+            conn.execute(
+                "CREATE TEMP TABLE swap_keys (ExpansionCode TEXT, CollectorNumber TEXT, "
+                "PRIMARY KEY (ExpansionCode, CollectorNumber)) WITHOUT ROWID"
+            )
+            conn.executemany("INSERT INTO swap_keys VALUES (?, ?)", lookup_keys)
+            for exp_code, coll_num, grp_id, art_id in conn.execute(CARD_AND_ART_IDS_QUERY):
+                # Keep the first match, like the previous one-query-per-card lookup did
+                ids_by_key.setdefault((exp_code, coll_num), (grp_id, art_id))
+    except sqlite3.Error as e:
+        print(f"❌ Database error while looking up cards: {e}")
+    finally:
+        conn.close()
+
+    for source_name, key in wanted_cards:
+        if key in ids_by_key:
+            card_data[source_name] = ids_by_key[key] # Store as a tuple (GrpId, ArtId)
     return card_data
 
-def find_asset_bundles(data_path: Path, card_id: int, art_id: int) -> Tuple[Optional[Path], Optional[Path]]:
+def index_asset_bundles(asset_dir: Path) -> Optional[Dict]:
+    """
+    Lists the AssetBundle directory once and indexes its bundles for fast lookups.
+    Individual files are keyed by their ID, ranged bundles are stored as sorted (start, end, path) lists.
+    """
+    if not asset_dir.exists():
+        print("   - ❌ AssetBundle directory does not exist!")
+        return None
+
+    bundle_index = {"art_files": {}, "card_files": {}, "art_ranges": [], "card_ranges": []}
+    with os.scandir(asset_dir) as entries:
+        for entry in entries:
+            match = RANGED_BUNDLE_RE.match(entry.name)
+            if match:
+                kind, start, end = match.groups()
+                ranges_key = "art_ranges" if kind == "cardart" else "card_ranges"
+                bundle_index[ranges_key].append((int(start), int(end), Path(entry.path)))
+                continue
+            match = INDIVIDUAL_BUNDLE_RE.match(entry.name)
+            if match:
+                item_id, kind = match.groups()
+                files_key = "art_files" if kind == "CardArt" else "card_files"
+                bundle_index[files_key].setdefault(int(item_id), Path(entry.path))
+
+    bundle_index["art_ranges"].sort()
+    bundle_index["card_ranges"].sort()
+    return bundle_index
+
+def find_ranged_bundle(bundle_ranges: List[Tuple[int, int, Path]], item_id: int) -> Optional[Path]:
+    """
+    Finds the ranged bundle containing an ID with a binary search over the sorted (start, end, path) list.
+    Nothing guarantees that bundle ranges never overlap, so when the closest range ends before the ID,
+    the earlier ranges are checked too. Of several containing ranges, the one starting last wins.
+    """
+    # Only ranges starting at or before the ID can contain it; the last of them is the usual hit
+    index = bisect.bisect_right(bundle_ranges, (item_id, sys.maxsize))
+    for candidate in range(index - 1, -1, -1):
+        _, end, bundle_path = bundle_ranges[candidate]
+        if end >= item_id:
+            return bundle_path
+    return None
+
+def find_asset_bundles(bundle_index: Dict, card_id: int, art_id: int) -> Tuple[Optional[Path], Optional[Path]]:
     """Finds the asset bundles containing a card's art and data."""
-    asset_dir = data_path / "Downloads/AssetBundle"
     card_art_bundle, cards_bundle = None, None
-    
-    print(f"   - Searching for bundles for card ID: {card_id} and art ID: {art_id} in {asset_dir}")
 
-    if not asset_dir.exists():
-        print("   - ❌ AssetBundle directory does not exist!")
-        return None, None
+    print(f"   - Searching for bundles for card ID: {card_id} and art ID: {art_id}")
 
     # --- ART BUNDLE LOGIC: Handles individual files first, then ranged bundles ---
-    art_bundle_files = list(asset_dir.glob(f"{art_id}_CardArt_*.mtga"))
-    if art_bundle_files:
-        card_art_bundle = art_bundle_files[0]
+    if art_id in bundle_index["art_files"]:
+        card_art_bundle = bundle_index["art_files"][art_id]
         print(f"     - ✅ Found matching art file: {card_art_bundle.name}")
     else:
-        art_bundles_ranged = list(asset_dir.glob("cardart_*.bundle"))
-        for bundle in art_bundles_ranged:
-            try:
-                parts = bundle.stem.split('_')
-                if len(parts) == 3 and parts[1].isdigit() and parts[2].isdigit():
-                    start_id, end_id = int(parts[1]), int(parts[2])
-                    if start_id <= art_id <= end_id:
-                        card_art_bundle = bundle
-                        print(f"     - ✅ Found matching ranged art bundle: {bundle.name}")
-                        break
-            except (ValueError, IndexError):
-                continue
+        card_art_bundle = find_ranged_bundle(bundle_index["art_ranges"], art_id)
+        if card_art_bundle:
+            print(f"     - ✅ Found matching ranged art bundle: {card_art_bundle.name}")
 
     # --- CARDS BUNDLE LOGIC: Handles individual files first, then ranged bundles ---
-    cards_bundle_files = list(asset_dir.glob(f"{card_id}_Card_*.mtga"))
-    if cards_bundle_files:
-        cards_bundle = cards_bundle_files[0]
+    if card_id in bundle_index["card_files"]:
+        cards_bundle = bundle_index["card_files"][card_id]
         print(f"     - ✅ Found matching card data file: {cards_bundle.name}")
     else:
-        cards_bundles_ranged = list(asset_dir.glob("cards_*.bundle"))
-        for bundle in cards_bundles_ranged:
-            try:
-                parts = bundle.stem.split('_')
-                if len(parts) == 3 and parts[1].isdigit() and parts[2].isdigit():
-                    start_id, end_id = int(parts[1]), int(parts[2])
-                    if start_id <= card_id <= end_id:
-                        cards_bundle = bundle
-                        print(f"     - ✅ Found matching ranged cards bundle: {bundle.name}")
-                        break
-            except (ValueError, IndexError):
-                continue
-    
+        cards_bundle = find_ranged_bundle(bundle_index["card_ranges"], card_id)
+        if cards_bundle:
+            print(f"     - ✅ Found matching ranged cards bundle: {cards_bundle.name}")
+
     # --- FINAL FALLBACK ---
     # If we found an art bundle but not a cards bundle, assume they are the same file.
     if card_art_bundle and not cards_bundle:
         print("     - ⚠️ Could not find a separate cards bundle. Assuming data is in the art bundle.")
         cards_bundle = card_art_bundle
-            
+
     return card_art_bundle, cards_bundle
 
 # --- Core Logic Functions ---
 
-def fetch_scryfall_set_data(set_code: str) -> List[Dict]:
-    """Fetches all card data for a given set from Scryfall."""
-    all_cards = []
-    next_page_url = f"https://api.scryfall.com/cards/search?q=set:{set_code}"
-    print(f"Fetching card data for set: {set_code.upper()}...")
-    while next_page_url:
+def prepare_swap_targets(swap_jobs: List[Dict], temp_dir: Path) -> List[Dict]:
+    """
+    Fetches the target card data for all swaps in batches and picks the art to download for each.
+    Returns the swaps that have art to download, with their target name, art URL and download path.
+    """
+    target_cards = fetch_scryfall_cards([job['target_url'] for job in swap_jobs])
+
+    prepared_swaps = []
+    for job in swap_jobs:
+        source_name = job['source_name']
+        target_data = target_cards.get(job['target_url'])
+        if not target_data: print(f"   Skipping '{source_name}' due to API error."); continue
+
+        target_name = target_data.get('name', source_name)
+
+        target_type_line = target_data.get('type_line', '')
+        image_uris = target_data.get('image_uris', {})
+        is_saga = "Saga" in target_type_line
+
+        if is_saga:
+            image_url = image_uris.get('png')
+            print(f"   -> Saga detected for '{target_name}'. Using full card image to preserve chapters.")
+        else:
+            image_url = image_uris.get('art_crop')
+
+        if not image_url:
+            print(f"   Could not find art for '{target_name}'. Skipping."); continue
+
+        # Keep the real file extension: art crops are JPEGs, full card images are PNGs
+        image_suffix = Path(urlsplit(image_url).path).suffix or ".png"
+        image_path = temp_dir / f"{job['card_id']}{image_suffix}"
+        prepared_swaps.append(dict(job, target_name=target_name, is_saga=is_saga, image_url=image_url, image_path=image_path))
+
+    return prepared_swaps
+
+def download_and_apply_swaps(swaps: List[Dict]):
+    """
+    Downloads the art for all swaps and updates their bundles as a pipeline.
+    Each bundle goes to a worker process as soon as the art for every swap touching it has arrived,
+    so bundle processing overlaps with the remaining downloads.
+    """
+    # Number of downloads each bundle is still waiting for
+    pending_downloads = defaultdict(int)
+    for swap in swaps:
+        for bundle_path in {swap['art_bundle_path'], swap['cards_bundle_path']}:
+            pending_downloads[bundle_path] += 1
+    if not pending_downloads:
+        return
+
+    art_swaps_by_bundle = defaultdict(list)
+    titles_by_bundle = defaultdict(dict)
+    bundle_futures = []
+    # Bundles are independent and UnityPy's decoding/encoding is CPU bound, so update them in parallel processes.
+    # Downloads come from Scryfall's image CDN, which has no request rate limit, so they all run in parallel threads.
+    with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(pending_downloads))) as bundle_pool, \
+            ThreadPoolExecutor(max_workers=DOWNLOAD_MAX_WORKERS) as download_pool:
+        download_futures = {download_pool.submit(download_image, swap['image_url'], swap['image_path']): swap for swap in swaps}
+
+        for future in as_completed(download_futures):
+            swap = download_futures[future]
+            card_id = swap['card_id']
+            try:
+                downloaded = future.result()
+            except Exception as e:
+                # An unexpected error only loses this card; its bundles still get processed below
+                print(f"❌ Error downloading image {swap['image_url']}: {e}")
+                downloaded = False
+            if downloaded:
+                art_swaps_by_bundle[swap['art_bundle_path']].append((card_id, swap['art_id'], swap['image_path'], swap['is_saga']))
+                titles_by_bundle[swap['cards_bundle_path']][card_id] = swap['target_name']
+            else:
+                print(f"   Failed to download art for '{swap['target_name']}'. Skipping.")
+
+            for bundle_path in {swap['art_bundle_path'], swap['cards_bundle_path']}:
+                pending_downloads[bundle_path] -= 1
+                if pending_downloads[bundle_path] == 0:
+                    art_swaps = art_swaps_by_bundle.pop(bundle_path, [])
+                    titles = titles_by_bundle.pop(bundle_path, {})
+                    if art_swaps or titles:
+                        bundle_futures.append(bundle_pool.submit(
+                            process_bundle_in_worker, UnityPy.config.FALLBACK_UNITY_VERSION, bundle_path, art_swaps, titles
+                        ))
+
+        for future in as_completed(bundle_futures):
+            print(future.result(), end="")
+
+@lru_cache(maxsize=8)
+def fetch_set_cards(set_code: str) -> Tuple[Mapping, ...]:
+    """
+    Fetches all cards of a set from Scryfall, memoized in memory and on disk for a day.
+    The first page tells us how many cards there are, the remaining pages are fetched concurrently.
+    Errors are raised instead of returned, so failed fetches are never cached.
+    """
+    # Set codes are short alphanumeric strings; anything else is not safe to use as a file name
+    cache_path = SET_CACHE_DIR / f"{set_code}.json" if set_code.isalnum() else None
+    if cache_path:
         try:
-            response = requests.get(next_page_url)
-            response.raise_for_status()
-            data = response.json()
-            all_cards.extend(data.get('data', []))
-            next_page_url = data.get('next_page')
-            time.sleep(0.1)  # Be nice to the API
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Error fetching data from Scryfall for set {set_code.upper()}: {e}")
-            return []
-    return all_cards
+            if time.time() - cache_path.stat().st_mtime < SET_CACHE_MAX_AGE:
+                return tuple(MappingProxyType(card) for card in json.loads(cache_path.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            pass  # No usable cached copy, fetch it again
+
+    search_url = "https://api.scryfall.com/cards/search"
+
+    def fetch_page(page: int) -> Dict:
+        scryfall_rate_limiter.acquire()
+        response = scryfall_session.get(search_url, params={"q": f"set:{set_code}", "page": page})
+        response.raise_for_status()
+        return response.json()
+
+    first_page = fetch_page(1)
+    all_cards = list(first_page.get('data', []))
+    if first_page.get('has_more'):
+        total_pages = math.ceil(first_page.get('total_cards', 0) / SCRYFALL_PAGE_SIZE)
+        with ThreadPoolExecutor(max_workers=SCRYFALL_MAX_WORKERS) as executor:
+            # map() keeps the pages in order, so the card list matches the serial crawl
+            for page_data in executor.map(fetch_page, range(2, total_pages + 1)):
+                all_cards.extend(page_data.get('data', []))
+
+    if cache_path:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_text(json.dumps(all_cards), encoding="utf-8")
+        except OSError as e:
+            print(f"⚠️ Could not cache card data for set {set_code.upper()}: {e}")
+    return tuple(MappingProxyType(card) for card in all_cards)
+
+def fetch_scryfall_set_data(set_code: str) -> List[Mapping]:
+    """Fetches all card data for a given set from Scryfall, reusing recently fetched sets."""
+    set_code = set_code.strip().lower()
+    print(f"Fetching card data for set: {set_code.upper()}...")
+    try:
+        return list(fetch_set_cards(set_code))
+    except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+        print(f"❌ Error fetching data from Scryfall for set {set_code.upper()}: {e}")
+        return []
 
 def generate_swap_file(source_set_code: str, target_set_code: str):
     """
@@ -351,14 +767,221 @@ def generate_swap_file(source_set_code: str, target_set_code: str):
         print(f"❌ Error writing to `swaps.json` in Downloads folder: {e}")
 
 
-def perform_swap(mtga_path: Optional[Path]):
+def link_or_copy_file(src_path: Path, dst_path: Path):
+    """
+    Puts a copy of a bundle at dst_path without copying its bytes where the file system allows it.
+    A hard link is safe because modified bundles are written to a new file and moved into place,
+    which leaves the linked original untouched. Falls back to an APFS clone on macOS, then to a full copy.
+    Used both to take backups and to restore them.
+    """
+    # Everything goes to a temporary name first and is then moved over dst_path. An existing backup is
+    # never redone, so an interrupted copy must not be left behind under the real name, and os.link
+    # can't overwrite the bundle being restored.
+    tmp_path = dst_path.with_name(dst_path.name + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+    try:
+        try:
+            os.link(src_path, tmp_path)
+        except OSError:
+            # Different drive (EXDEV), or a file system without hard links
+            cloned = False
+            if platform.system() == "Darwin":
+                # cp -c uses clonefile(2), a copy-on-write clone on APFS
+                cloned = subprocess.run(["cp", "-c", str(src_path), str(tmp_path)], capture_output=True).returncode == 0
+            if not cloned:
+                shutil.copyfile(src_path, tmp_path)
+        os.replace(tmp_path, dst_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+def write_bundle_atomically(bundle_path: Path, data: bytes):
+    """
+    Writes a bundle to a temporary file next to it and then moves it into place.
+    If the write is interrupted the original bundle stays intact, and hard-linked backups are never modified.
+    """
+    tmp_path = bundle_path.with_name(bundle_path.name + ".tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            # Make sure the new bundle is on disk before it replaces the old one
+            os.fsync(f.fileno())
+        os.replace(tmp_path, bundle_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+def fit_saga_art(img: Image.Image, width: int, height: int) -> Image.Image:
+    """Scales full Saga card art to fit inside a horizontal art frame, letterboxed in black."""
+    target_width, target_height = width, height
+
+    original_width, original_height = img.size
+    new_height = int(target_width * (original_height / original_width))
+
+    if new_height > target_height:
+        new_height = target_height
+        target_width = int(new_height * (original_width / original_height))
+
+    # reducing_gap lets Pillow shrink with a fast integer box reduce before the LANCZOS pass
+    resized_img = img.resize((target_width, new_height), Image.Resampling.LANCZOS, reducing_gap=SAGA_RESIZE_REDUCING_GAP)
+
+    final_img = Image.new("RGB", (width, height), (0, 0, 0))
+    paste_x = (width - target_width) // 2
+    paste_y = (height - new_height) // 2
+    final_img.paste(resized_img, (paste_x, paste_y))
+    return final_img
+
+def peek_object_name(obj) -> Optional[str]:
+    """
+    Reads just an object's name, which skips parsing the rest of it. Returns None if the name can't be peeked:
+    older UnityPy versions have no peek_name, and it returns None when the type tree has no name node.
+    """
+    peek_name = getattr(obj, "peek_name", None)
+    return peek_name() if peek_name else None
+
+def get_object_name(obj) -> str:
+    """Returns an object's name, only reading the whole object when the name can't be peeked."""
+    name = peek_object_name(obj)
+    return name if name is not None else obj.read().m_Name
+
+def find_art_texture(textures_by_name: Dict[str, object], card_id: int, art_id: int, texture_area: Callable[[object], int]):
+    """
+    Finds the texture named after a card or its art ID, e.g. Card_Art_{card_id}, {art_id} or {art_id}_AIF.
+    An art can have several {art_id}_* textures; the largest of them is the main art.
+    """
+    for name in (f"Card_Art_{card_id}", str(art_id)):
+        if name in textures_by_name:
+            return textures_by_name[name]
+    art_prefix = f"{art_id}_"
+    prefixed_textures = [obj for name, obj in textures_by_name.items() if name.startswith(art_prefix)]
+    return max(prefixed_textures, key=texture_area, default=None)
+
+def replace_card_art(all_textures: List, textures_by_name: Dict[str, object], bundle_name: str,
+                     art_swaps: List[Tuple[int, int, Path, bool]], single_art_file: bool) -> bool:
+    """
+    Replaces the art texture for each swap among a bundle's Texture2D objects. Returns True if the bundle was changed.
+    Only a single-card {art_id}_CardArt_*.mtga file may fall back to its largest texture when no texture is named after the card.
+    """
+    if not all_textures:
+        print(f"   -> ❌ No textures found in {bundle_name}")
+        return False
+
+    texture_reads = {}
+    def read_texture(obj):
+        if obj.path_id not in texture_reads:
+            texture_reads[obj.path_id] = obj.read()
+        return texture_reads[obj.path_id]
+
+    def texture_area(obj) -> int:
+        texture = read_texture(obj)
+        return getattr(texture, 'm_Width', 0) * getattr(texture, 'm_Height', 0)
+
+    replaced_ids = set()
+    modified = False
+    for card_id, art_id, image_path, is_saga in art_swaps:
+        art_texture_obj = find_art_texture(textures_by_name, card_id, art_id, texture_area)
+        if art_texture_obj is None:
+            if not single_art_file:
+                # Any other texture in a ranged bundle belongs to a different card
+                print(f"   -> ⚠️ No texture named after card {card_id} (art {art_id}) in {bundle_name}. Skipping.")
+                continue
+            # A single-card art file holds one art, and its largest texture is the main art
+            art_texture_obj = max(all_textures, key=texture_area)
+        if art_texture_obj.path_id in replaced_ids:
+            print(f"   -> Art {art_id} was already replaced in {bundle_name}. Skipping card {card_id}.")
+            continue
+
+        art_texture = read_texture(art_texture_obj)
+        texture_size = (art_texture.m_Width, art_texture.m_Height)
+        with Image.open(image_path) as img:
+            # Image.open only reads the header. For JPEG art at least twice the texture size, decode
+            # straight to a reduced scale; this is faster and needs a fraction of the memory. PNGs are unaffected.
+            img.draft("RGB", texture_size)
+            # Art that already matches the texture size needs no resampling
+            if is_saga and img.size != texture_size:
+                print("      -> Resizing Saga art to fit horizontal frame...")
+                img = fit_saga_art(img, *texture_size)
+
+            art_texture.image = img
+            art_texture.save()
+        # The art is encoded into the texture now, so free its disk space right away
+        image_path.unlink(missing_ok=True)
+        replaced_ids.add(art_texture_obj.path_id)
+        modified = True
+        print(f"   -> Art for card {card_id} replaced in: {bundle_name}")
+    return modified
+
+def replace_card_titles(text_assets: List, bundle_name: str, titles: Dict[int, str]) -> bool:
+    """Replaces card names among a bundle's TextAsset objects in a single pass. Returns True if the bundle was changed."""
+    remaining_titles = {f"Card_Title_{card_id}": name for card_id, name in titles.items()}
+    modified = False
+    for obj in text_assets:
+        # Most text assets are not titles we want. Peeking at the name skips parsing the text of
+        # every non-matching asset; assets whose name can't be peeked are read in full.
+        name = peek_object_name(obj)
+        if name is not None and name not in remaining_titles:
+            continue
+        data = obj.read()
+        if data.m_Name in remaining_titles:
+            data.text = remaining_titles.pop(data.m_Name)
+            data.save()
+            modified = True
+            print(f"   -> Name replaced in: {bundle_name}")
+            if not remaining_titles:
+                break
+    return modified
+
+def process_bundle(bundle_path: Path, art_swaps: List[Tuple[int, int, Path, bool]], titles: Dict[int, str]):
+    """Loads a bundle once, applies all art and name replacements for it, and saves it once."""
+    env = UnityPy.load(str(bundle_path))
+
+    # Sort the objects by type in one walk and look textures up by name; only the objects that can change are read later
+    all_textures, text_assets = [], []
+    textures_by_name = {}
+    for obj in env.objects:
+        type_name = obj.type.name
+        if type_name == "Texture2D":
+            all_textures.append(obj)
+            if art_swaps:
+                textures_by_name.setdefault(get_object_name(obj), obj)
+        elif type_name == "TextAsset":
+            text_assets.append(obj)
+
+    modified = False
+    if art_swaps:
+        bundle_match = INDIVIDUAL_BUNDLE_RE.match(bundle_path.name)
+        single_art_file = bool(bundle_match) and bundle_match.group(2) == "CardArt"
+        modified = replace_card_art(all_textures, textures_by_name, bundle_path.name, art_swaps, single_art_file)
+    if titles:
+        modified = replace_card_titles(text_assets, bundle_path.name, titles) or modified
+
+    if modified:
+        write_bundle_atomically(bundle_path, env.file.save())
+
+def process_bundle_in_worker(unity_version: str, bundle_path: Path, art_swaps: List[Tuple[int, int, Path, bool]], titles: Dict[int, str]) -> str:
+    """
+    Runs process_bundle in a worker process.
+    Returns everything it printed, so the log can be shown in the main window.
+    """
+    # Worker processes don't inherit the detected version from the main process
+    UnityPy.config.FALLBACK_UNITY_VERSION = unity_version
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        print(f"\nUpdating bundle {bundle_path.name}")
+        try:
+            process_bundle(bundle_path, art_swaps, titles)
+        except Exception as e:
+            print(f"   -> ❌ Failed to update {bundle_path.name}: {e}")
+    return log.getvalue()
+
+def perform_swap(data_path: Optional[Path]):
     """Main function to perform all card swaps defined in swaps.json."""
-    if not mtga_path:
+    if not data_path:
         print("\n❌ MTG Arena path not set. Please find or select it first.")
         return
 
     print("\n--- Starting Card Swap Process ---")
-    data_path = get_data_path(mtga_path)
 
     # --- MODIFIED PART ---
     # Look for swaps.json in the user's Downloads folder
@@ -374,128 +997,74 @@ def perform_swap(mtga_path: Optional[Path]):
     db_path = get_mtga_database(data_path)
     if not db_path: return
 
-    card_data_map = get_card_and_art_ids_from_db(db_path, swaps_config)
+    card_data_map = get_card_and_art_ids_from_db(get_indexed_database(db_path), swaps_config)
 
     found_count = len(card_data_map)
     total_count = len(swaps_config)
     print(f"\nFound {found_count} out of {total_count} cards in the database.")
 
-    if found_count < total_count:
-        source_names_in_config = {swap['source_card_name'] for swap in swaps_config}
-        missing_cards = source_names_in_config - set(card_data_map.keys())
-        if missing_cards: print(f"⚠️ Could not find in database: {', '.join(sorted(list(missing_cards)))}")
+    resolved_swaps, missing_swaps = [], []
+    for swap in swaps_config:
+        (resolved_swaps if swap['source_card_name'] in card_data_map else missing_swaps).append(swap)
+    if missing_swaps:
+        # Listed in swaps.json order, once per name
+        missing_names = dict.fromkeys(swap['source_card_name'] for swap in missing_swaps)
+        print(f"⚠️ Could not find in database: {', '.join(missing_names)}")
 
     if not card_data_map:
         print("\nNo cards to process. Exiting swap.")
         return
 
+    bundle_index = index_asset_bundles(data_path / "Downloads/AssetBundle")
+    if not bundle_index: return
+
     temp_dir = Path("./temp_art")
-    backup_dir = Path.home() / "MTGA_Swapper_Backups" # Also move backups to a user folder
+    backup_dir = BACKUP_DIR
     temp_dir.mkdir(exist_ok=True); backup_dir.mkdir(exist_ok=True)
 
-    print("\nProcessing swaps...")
-    # (The rest of the function remains the same)
-    try:
-        for swap in swaps_config:
-            source_name = swap['source_card_name']
-            if source_name not in card_data_map: continue
-
-            card_id, art_id = card_data_map[source_name]
-            print(f"\nProcessing swap for '{source_name}' (ID: {card_id})")
-
-            target_url = swap.get('target_api_url') or swap.get('target_scryfall_url')
-            if not target_url:
-                print(f"   Skipping '{source_name}' because its target URL is missing in swaps.json.")
-                continue
-
-            target_data = get_card_data_from_url(target_url)
-            if not target_data: print(f"   Skipping '{source_name}' due to API error."); continue
-
-            target_name = target_data.get('name', source_name)
-
-            target_type_line = target_data.get('type_line', '')
-            image_uris = target_data.get('image_uris', {})
-            image_url = None
-            is_saga = "Saga" in target_type_line
-
-            if is_saga:
-                image_url = image_uris.get('png')
-                print("   -> Saga detected. Using full card image to preserve chapters.")
-            else:
-                image_url = image_uris.get('art_crop')
-
-            if not image_url: 
-                print(f"   Could not find art for '{target_name}'. Skipping."); continue
-
-            image_path = temp_dir / f"{card_id}.png"
-            if not download_image(image_url, image_path): print(f"   Failed to download art for '{target_name}'. Skipping."); continue
-
-            art_bundle_path, cards_bundle_path = find_asset_bundles(data_path, card_id, art_id)
-            if not all([art_bundle_path, cards_bundle_path]): print(f"   ❌ Could not locate asset bundles for '{source_name}'. Skipping."); continue
-
-            for bundle_path in {art_bundle_path, cards_bundle_path}:
-                if bundle_path:
-                    backup_path = backup_dir / bundle_path.name
-                    if not backup_path.exists():
-                        shutil.copy(bundle_path, backup_dir)
-                        print(f"        - Backed up {bundle_path.name}")
-                    else:
-                        print(f"        - Backup for {bundle_path.name} already exists. Skipping.")
+    swap_jobs = []
+    # Each card's art is downloaded to a file named after its ID and deleted once it's used,
+    # so a card listed twice would fight over that file. The first entry wins.
+    seen_card_ids = set()
+    for swap in resolved_swaps:
+        source_name = swap['source_card_name']
 
-            env_art = UnityPy.load(str(art_bundle_path))
-
-            all_textures = [obj for obj in env_art.objects if obj.type.name == "Texture2D"]
-
-            if all_textures:
-                all_textures.sort(key=lambda x: x.read().m_Width * x.read().m_Height if hasattr(x.read(), 'm_Width') else 0, reverse=True)
-                main_art_texture_obj = all_textures[0]
-                main_art_texture = main_art_texture_obj.read()
-
-                img = Image.open(image_path)
-                if is_saga:
-                    print("      -> Resizing Saga art to fit horizontal frame...")
-                    target_width, target_height = main_art_texture.m_Width, main_art_texture.m_Height
-
-                    original_width, original_height = img.size
-                    new_height = int(target_width * (original_height / original_width))
-
-                    if new_height > target_height:
-                        new_height = target_height
-                        target_width = int(new_height * (original_height / original_height))
-
-                    resized_img = img.resize((target_width, new_height), Image.Resampling.LANCZOS)
-
-                    final_img = Image.new("RGB", (main_art_texture.m_Width, main_art_texture.m_Height), (0, 0, 0))
-                    paste_x = (main_art_texture.m_Width - target_width) // 2
-                    paste_y = (main_art_texture.m_Height - new_height) // 2
-                    final_img.paste(resized_img, (paste_x, paste_y))
-                    img = final_img
-
-                main_art_texture.image = img
-                main_art_texture_obj.save(main_art_texture)
+        target_url = swap.get('target_api_url') or swap.get('target_scryfall_url')
+        if not target_url:
+            print(f"   Skipping '{source_name}' because its target URL is missing in swaps.json.")
+            continue
 
-                with open(art_bundle_path, "wb") as f:
-                    f.write(env_art.file.save())
-                print(f"   -> Art replaced in: {art_bundle_path.name}")
-            else:
-                print(f"   -> ❌ No textures found in {art_bundle_path.name}")
+        card_id, art_id = card_data_map[source_name]
+        if card_id in seen_card_ids:
+            print(f"   Skipping duplicate entry for '{source_name}' in swaps.json.")
+            continue
+        seen_card_ids.add(card_id)
+        print(f"\nLocating bundles for '{source_name}' (ID: {card_id})")
+        art_bundle_path, cards_bundle_path = find_asset_bundles(bundle_index, card_id, art_id)
+        if not all([art_bundle_path, cards_bundle_path]): print(f"   ❌ Could not locate asset bundles for '{source_name}'. Skipping."); continue
+
+        swap_jobs.append({
+            "source_name": source_name, "card_id": card_id, "art_id": art_id, "target_url": target_url,
+            "art_bundle_path": art_bundle_path, "cards_bundle_path": cards_bundle_path
+        })
 
-            if cards_bundle_path != art_bundle_path:
-                env_cards = UnityPy.load(str(cards_bundle_path))
+    try:
+        print(f"\nFetching target card data for {len(swap_jobs)} cards...")
+        prepared_swaps = prepare_swap_targets(swap_jobs, temp_dir)
+
+        # Every bundle is backed up before the first one is modified
+        bundle_paths = dict.fromkeys(path for swap in prepared_swaps for path in (swap['art_bundle_path'], swap['cards_bundle_path']))
+        print("\nBacking up bundles...")
+        for bundle_path in bundle_paths:
+            backup_path = backup_dir / bundle_path.name
+            if not backup_path.exists():
+                link_or_copy_file(bundle_path, backup_path)
+                print(f"        - Backed up {bundle_path.name}")
             else:
-                env_cards = env_art
+                print(f"        - Backup for {bundle_path.name} already exists. Skipping.")
 
-            for obj in env_cards.objects:
-                if obj.type.name == "TextAsset":
-                    data = obj.read()
-                    if data.m_Name == f"Card_Title_{card_id}":
-                        data.text = target_name
-                        obj.save(data)
-                        print(f"   -> Name replaced in: {cards_bundle_path.name}")
-                        break
-
-            with open(cards_bundle_path, "wb") as f:
-                f.write(env_cards.file.save())
+        print(f"\nDownloading art and processing swaps for {len(prepared_swaps)} cards...")
+        download_and_apply_swaps(prepared_swaps)
 
     finally:
         if temp_dir.exists():
@@ -503,40 +1072,50 @@ def perform_swap(mtga_path: Optional[Path]):
         print("\n--- ✅ Swap Process Complete! ---")
         print("Launch MTG Arena to see your changes.")
 
-def restore_backups(mtga_path: Optional[Path]):
+def restore_backups(data_path: Optional[Path]):
     """Restores original asset bundles from the backup directory."""
-    if not mtga_path:
+    if not data_path:
         print("\n❌ MTG Arena path not set. Please find or select it first.")
         return
         
     print("\n--- Restoring Original Game Files ---")
-    data_path = get_data_path(mtga_path)
     
     asset_dir = data_path / "Downloads/AssetBundle"
-    backup_dir = Path("./MTGA_Swapper_Backups")
+    backup_dir = BACKUP_DIR
     
     if not backup_dir.exists() or not any(backup_dir.iterdir()):
         print("ℹ️ No backups found. Nothing to restore."); return
         
     backups = list(backup_dir.glob("*.bundle")) + list(backup_dir.glob("*.mtga"))
     print(f"Found {len(backups)} files to restore.")
-    for backup_file in backups: shutil.copy(backup_file, asset_dir / backup_file.name)
+    if not backups: return
+
+    def restore_file(backup_file: Path):
+        target_path = asset_dir / backup_file.name
+        # A hard-linked backup of a bundle that was never modified is already the original
+        if target_path.exists() and os.path.samefile(backup_file, target_path): return
+        link_or_copy_file(backup_file, target_path)
+
+    # Hard links are instant; when they fall back to full copies, several run at once
+    with ThreadPoolExecutor(max_workers=min(8, len(backups))) as executor:
+        list(executor.map(restore_file, backups))
 
     print("\n--- ✅ Restore Complete! ---")
     print("Your game files have been returned to their original state.")
 
 # --- GUI Application using Tkinter ---
 
+# How often the GUI moves queued log output into the log widget, and how many lines it keeps.
+LOG_FLUSH_INTERVAL_MS = 50
+LOG_MAX_LINES = 10000
+
 class StdoutRedirector:
-    def __init__(self, text_widget):
-        self.text_space = text_widget
-        self.text_space.see("end")
+    """Queues written text; the GUI thread drains the queue into the log widget in batches."""
+    def __init__(self, log_queue: queue.Queue):
+        self.log_queue = log_queue
 
     def write(self, string):
-        self.text_space.configure(state='normal')
-        self.text_space.insert('end', string)
-        self.text_space.see('end')
-        self.text_space.configure(state='disabled')
+        self.log_queue.put_nowait(string)
 
     def flush(self):
         pass
@@ -548,10 +1127,34 @@ class App(tk.Tk):
        ## self.geometry("650x600")
        ## self.resizable(False, False)
         self.mtga_path: Optional[Path] = None
+        # Resolved once when the path is found, then handed to every action
+        self.data_path: Optional[Path] = None
         self.create_widgets()
-        sys.stdout = StdoutRedirector(self.log_widget)
-        sys.stderr = StdoutRedirector(self.log_widget)
-        
+        self.log_queue: queue.Queue = queue.Queue()
+        sys.stdout = StdoutRedirector(self.log_queue)
+        sys.stderr = StdoutRedirector(self.log_queue)
+        self.after(LOG_FLUSH_INTERVAL_MS, self._drain_log_queue)
+
+    def _drain_log_queue(self):
+        """Writes all queued log output to the widget in one update, then reschedules itself."""
+        chunks = []
+        try:
+            while True:
+                chunks.append(self.log_queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        if chunks:
+            self.log_widget.configure(state='normal')
+            self.log_widget.insert('end', ''.join(chunks))
+            # Drop the oldest lines so the widget doesn't grow without bound
+            line_count = int(self.log_widget.index('end-1c').split('.')[0])
+            if line_count > LOG_MAX_LINES:
+                self.log_widget.delete('1.0', f'{line_count - LOG_MAX_LINES + 1}.0')
+            self.log_widget.see('end')
+            self.log_widget.configure(state='disabled')
+        self.after(LOG_FLUSH_INTERVAL_MS, self._drain_log_queue)
+
     def create_widgets(self):
         main_frame = ttk.Frame(self, padding="10")
         main_frame.pack(fill="both", expand=True)
@@ -584,10 +1187,10 @@ class App(tk.Tk):
         action_frame = ttk.Frame(main_frame); action_frame.pack(fill="x", pady=10)
         
         # Action Buttons
-        self.swap_button = ttk.Button(action_frame, text="Apply Swaps", command=lambda: self.run_in_thread(perform_swap, self.mtga_path))
+        self.swap_button = ttk.Button(action_frame, text="Apply Swaps", command=lambda: self.run_in_thread(perform_swap, self.data_path))
         self.swap_button.pack(side="left", expand=True, fill="x", padx=2)
         
-        self.restore_button = ttk.Button(action_frame, text="Restore Originals", command=lambda: self.run_in_thread(restore_backups, self.mtga_path))
+        self.restore_button = ttk.Button(action_frame, text="Restore Originals", command=lambda: self.run_in_thread(restore_backups, self.data_path))
         self.restore_button.pack(side="left", expand=True, fill="x", padx=2)
         
         self.exit_button = ttk.Button(action_frame, text="Exit", command=self.destroy)
@@ -597,11 +1200,18 @@ class App(tk.Tk):
         self.run_in_thread(self._find_path_auto_task)
             
     def _find_path_auto_task(self):
-        self.mtga_path = find_mtga_path()
-        self.path_var.set(f"Path: {self.mtga_path}" if self.mtga_path else "Path: Not Found")
-        if self.mtga_path:
+        mtga_path = find_mtga_path()
+        data_path = get_data_path(mtga_path) if mtga_path else None
+        # Tk isn't thread-safe, so hand the result back to the main loop
+        self.after(0, lambda: self._set_found_path(mtga_path, data_path))
+
+    def _set_found_path(self, mtga_path: Optional[Path], data_path: Optional[Path]):
+        self.mtga_path = mtga_path
+        self.data_path = data_path
+        self.path_var.set(f"Path: {mtga_path}" if mtga_path else "Path: Not Found")
+        if data_path:
             # Configure Unity version immediately after finding the path
-            self.after(0, lambda: configure_unity_version(get_data_path(self.mtga_path)))
+            configure_unity_version(data_path)
 
     def find_path_manual(self):
         initial_dir = {"Windows": "C:/", "Darwin": "/Applications"}.get(platform.system(), "/")
@@ -612,12 +1222,14 @@ class App(tk.Tk):
             asset_bundle_path = data_path / "Downloads/AssetBundle"
             if asset_bundle_path.exists():
                 self.mtga_path = selected_path
+                self.data_path = data_path
                 self.path_var.set(f"Path: {self.mtga_path}")
                 print(f"✅ Manually selected path is valid: {self.mtga_path}")
                 # Configure Unity version once path is found
                 configure_unity_version(data_path)
             else:
                 self.mtga_path = None
+                self.data_path = None
                 self.path_var.set("Path: Invalid Folder Selected")
                 print(f"❌ Manually selected path is NOT a valid MTGA folder: {selected_path}")
                 messagebox.showerror("Invalid Folder", "The selected folder is not a valid MTG Arena installation.")
@@ -646,5 +1258,7 @@ class App(tk.Tk):
                 button.config(state=state)
 
 if __name__ == "__main__":
+    # Needed for the bundle worker processes when running as a PyInstaller executable
+    multiprocessing.freeze_support()
     app = App()
     app.mainloop()